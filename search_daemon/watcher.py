@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import logging
+import os
+import queue
 import signal
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
@@ -11,53 +14,203 @@ from watchdog.observers import Observer, ObserverType
 from .cache import FileIndexCache
 from .config import Config, FolderConfig
 from .indexer import Indexer
-from .reindexer import pop_requests
+from .reindexer import REQUESTS_PATH, pop_requests, start_server
 from .status import StatusTracker
 from .store import ChromaStore
 
 logger = logging.getLogger(__name__)
 
+# Editors and checkouts emit bursts of events for the same file; waiting this
+# long before flushing collapses a burst into one queued operation.
+DEBOUNCE_SECONDS = 0.25
+EVENT_QUEUE_SIZE = 10_000
+
+# Polling cadence for folders on network mounts, where a native observer
+# can't see events. 1 s (watchdog's default) walks the tree constantly; at
+# 30 s an idle daemon stays effectively silent.
+DEFAULT_POLL_INTERVAL = 30.0
+
+NETWORK_FS_TYPES = {"nfs", "nfs4", "cifs", "smbfs", "smb3", "afpfs", "fuse.sshfs", "9p"}
+
 
 class FileEventHandler(FileSystemEventHandler):
-    def __init__(self, indexer: Indexer, folder: FolderConfig):
+    """Coalesces watchdog events into a shared queue.
+
+    The watchdog dispatcher thread never does indexing work: each callback
+    records the latest operation per path in a pending dict and arms a short
+    debounce timer. When it fires, the pending operations are flushed to the
+    event queue consumed by the daemon's worker pool.
+    """
+
+    def __init__(
+        self,
+        indexer: Indexer,
+        folder: FolderConfig,
+        event_queue: queue.Queue,
+    ):
         super().__init__()
         self._indexer = indexer
         self._folder = folder
-        self._exts = set(folder.extensions)
+        # Precompiled for _relevant: str.endswith with a tuple is one C-level
+        # check, and slicing the tail bounds the .lower() allocation
+        self._ext_tuple = tuple(folder.extensions_set)
+        self._ext_maxlen = max(map(len, self._ext_tuple))
+        self._queue = event_queue
+        self._pending: dict[str, str] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_timer: threading.Timer | None = None
+        self._paused = False
 
     def _relevant(self, path: str) -> bool:
-        return Path(path).suffix.lower() in self._exts
+        return path[-self._ext_maxlen :].lower().endswith(self._ext_tuple)
+
+    def pause(self) -> None:
+        """Hold events in the pending dict instead of flushing them."""
+        with self._pending_lock:
+            self._paused = True
+
+    def resume(self) -> None:
+        """Release held events; used once the folder's initial scan is done."""
+        with self._pending_lock:
+            self._paused = False
+            if self._pending:
+                self._arm_flush_locked()
+
+    def _arm_flush_locked(self) -> None:
+        # Caller holds _pending_lock
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(DEBOUNCE_SECONDS, self._flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _enqueue(self, op: str, path: str) -> None:
+        with self._pending_lock:
+            self._pending[path] = op
+            if not self._paused:
+                self._arm_flush_locked()
+
+    def _flush(self) -> None:
+        with self._pending_lock:
+            pending = self._pending
+            self._pending = {}
+            self._flush_timer = None
+        for path, op in pending.items():
+            try:
+                self._queue.put_nowait((op, self._folder, path))
+            except queue.Full:
+                logger.warning("Event queue full — dropping %s for %s", op, path)
 
     def on_created(self, event: FileSystemEvent) -> None:
         if not event.is_directory and self._relevant(event.src_path):
-            self._indexer.index_file(self._folder, Path(event.src_path))
+            self._enqueue("index", event.src_path)
 
     def on_modified(self, event: FileSystemEvent) -> None:
         if not event.is_directory and self._relevant(event.src_path):
-            self._indexer.index_file(self._folder, Path(event.src_path))
+            self._enqueue("index", event.src_path)
 
     def on_deleted(self, event: FileSystemEvent) -> None:
         if not event.is_directory and self._relevant(event.src_path):
-            self._indexer.remove_file(self._folder, Path(event.src_path))
+            self._enqueue("delete", event.src_path)
 
     def on_moved(self, event: FileSystemEvent) -> None:
         if event.is_directory:
             return
         if self._relevant(event.src_path):
-            self._indexer.remove_file(self._folder, Path(event.src_path))
+            self._enqueue("delete", event.src_path)
         if self._relevant(event.dest_path):
-            self._indexer.index_file(self._folder, Path(event.dest_path))
+            self._enqueue("index", event.dest_path)
+
+
+class ReindexRequestHandler(FileSystemEventHandler):
+    """Fires the drain callback when the fallback request file is written."""
+
+    def __init__(self, request_file: str, drain):
+        super().__init__()
+        self._request_file = request_file
+        self._drain = drain
+
+    def on_created(self, event: FileSystemEvent) -> None:
+        if event.src_path == self._request_file:
+            self._drain()
+
+    def on_modified(self, event: FileSystemEvent) -> None:
+        if event.src_path == self._request_file:
+            self._drain()
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        # request_reindex lands the file via os.replace
+        if event.dest_path == self._request_file:
+            self._drain()
+
+
+def _is_network_mount(path: Path) -> bool:
+    """Best-effort check whether path lives on a network filesystem.
+
+    Reads /proc/self/mountinfo on Linux; on platforms without it (macOS)
+    the native observer is assumed fine.
+    """
+    try:
+        with open("/proc/self/mountinfo") as f:
+            mounts: list[tuple[str, str]] = []
+            for line in f:
+                fields = line.split(" ")
+                try:
+                    sep = fields.index("-")
+                except ValueError:
+                    continue
+                mounts.append((fields[4], fields[sep + 1]))
+    except OSError:
+        return False
+
+    target = str(path.resolve())
+    mount_point, fs_type = "", ""
+    for point, fstype in mounts:
+        if (target == point or target.startswith(point.rstrip("/") + "/")) and len(point) > len(mount_point):
+            mount_point, fs_type = point, fstype
+    return fs_type in NETWORK_FS_TYPES or fs_type.startswith("fuse.sshfs")
+
+
+def _make_observer(folder: FolderConfig) -> ObserverType:
+    if _is_network_mount(folder.path):
+        from watchdog.observers.polling import PollingObserver
+
+        interval = folder.poll_interval or DEFAULT_POLL_INTERVAL
+        logger.info("%s is on a network mount — polling every %.0fs", folder.path, interval)
+        return PollingObserver(timeout=interval)
+    # Observer already resolves to the native backend (inotify on Linux,
+    # FSEvents on macOS) for local filesystems.
+    return Observer()
+
+
+def _event_worker(indexer: Indexer, event_queue: queue.Queue) -> None:
+    while True:
+        item = event_queue.get()
+        if item is None:
+            event_queue.task_done()
+            return
+        op, folder, path_str = item
+        try:
+            # Strings all the way from the event callback; the indexer builds
+            # the one Path it needs
+            if op == "index":
+                indexer.index_file(folder, path_str)
+            else:
+                indexer.remove_file(folder, path_str)
+        except Exception:
+            logger.exception("Failed to handle %s event for %s", op, path_str)
+        finally:
+            event_queue.task_done()
 
 
 def run_daemon(config: Config) -> None:
+    stop_event = threading.Event()
     store = ChromaStore()
     status = StatusTracker()
-    status.start_heartbeat(interval=5.0)
+    status.start_heartbeat(interval=5.0, stop_event=stop_event)
     cache = FileIndexCache()
     indexer = Indexer(config, store, status=status, cache=cache)
 
     observers: list[ObserverType] = []
-    stop_event = threading.Event()
 
     def shutdown(signum, frame):
         logger.info("Shutting down daemon...")
@@ -68,42 +221,105 @@ def run_daemon(config: Config) -> None:
     signal.signal(signal.SIGTERM, shutdown)
     signal.signal(signal.SIGINT, shutdown)
 
+    event_queue: queue.Queue = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+    workers = [
+        threading.Thread(target=_event_worker, args=(indexer, event_queue), daemon=True)
+        for _ in range(min(8, os.cpu_count() or 4))
+    ]
+    for worker in workers:
+        worker.start()
+
+    # Arm every observer before any scan so changes landing mid-scan are
+    # captured; handlers hold their events until the folder's scan finishes.
+    handlers: list[tuple[FolderConfig, FileEventHandler]] = []
     for folder in config.folders:
-        indexer.initial_scan(folder)
-        handler = FileEventHandler(indexer, folder)
-        obs = Observer()
+        handler = FileEventHandler(indexer, folder, event_queue)
+        handler.pause()
+        obs = _make_observer(folder)
         obs.schedule(handler, str(folder.path), recursive=True)
         obs.start()
         observers.append(obs)
+        handlers.append((folder, handler))
         logger.info("Watching %s", folder.path)
 
+    def _scan_then_release(folder: FolderConfig, handler: FileEventHandler) -> None:
+        try:
+            indexer.initial_scan(folder)
+        except Exception:
+            # The executor swallows exceptions in submitted futures; log
+            # here or a failed scan would leave the folder silently
+            # "watching" over a half-built index.
+            logger.exception("Initial scan of %s failed", folder.path)
+        finally:
+            handler.resume()
+
+    # Scan folders in parallel: wall-clock startup drops from the sum of the
+    # scan times to the longest one
+    with ThreadPoolExecutor(max_workers=min(len(config.folders), 4)) as executor:
+        for folder, handler in handlers:
+            executor.submit(_scan_then_release, folder, handler)
+
     # Build folder lookup for reindex requests
     folder_map = {str(f.path): f for f in config.folders}
 
-    def _poll_reindex() -> None:
-        if stop_event.is_set():
-            return
+    reindex_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reindex")
+
+    def _run_reindex(folder: FolderConfig) -> None:
+        try:
+            indexer.initial_scan(folder)
+        except Exception:
+            logger.exception("Forced reindex of %s failed", folder.path)
+
+    def _handle_reindex(path_str: str) -> None:
+        folder = folder_map.get(path_str)
+        if folder:
+            logger.info("Force reindex requested for %s", path_str)
+            cache.invalidate(folder.path)
+            reindex_executor.submit(_run_reindex, folder)
+        else:
+            logger.warning("Reindex request for unknown folder %s — ignoring", path_str)
+
+    # Immediate path: menu bar connects to the daemon socket
+    start_server(_handle_reindex)
+
+    # Fallback path: the JSON request file. Watch its directory so writes
+    # are handled as they land, with a slow safety-net poll in case the
+    # watcher misses an event.
+    def _drain_requests() -> None:
         for path_str in pop_requests():
-            folder = folder_map.get(path_str)
-            if folder:
-                logger.info("Force reindex requested for %s", path_str)
-                cache.invalidate(folder.path)
-                threading.Thread(
-                    target=indexer.initial_scan,
-                    args=(folder,),
-                    daemon=True,
-                ).start()
-            else:
-                logger.warning("Reindex request for unknown folder %s — ignoring", path_str)
-        t = threading.Timer(5.0, _poll_reindex)
-        t.daemon = True
-        t.start()
+            _handle_reindex(path_str)
+
+    request_file = REQUESTS_PATH.expanduser().resolve()
+    request_file.parent.mkdir(parents=True, exist_ok=True)
+    request_obs = Observer()
+    request_obs.schedule(
+        ReindexRequestHandler(str(request_file), _drain_requests),
+        str(request_file.parent),
+        recursive=False,
+    )
+    request_obs.start()
+    observers.append(request_obs)
+
+    def _poll_reindex_loop() -> None:
+        while not stop_event.wait(60.0):
+            _drain_requests()
 
-    _poll_reindex()
+    threading.Thread(target=_poll_reindex_loop, daemon=True, name="reindex-poll").start()
+    _drain_requests()  # anything queued while the daemon was down
 
     logger.info("Daemon running. Press Ctrl+C to stop.")
     stop_event.wait()
 
     for obs in observers:
         obs.join()
+
+    # Drain in-flight events, then release the workers
+    event_queue.join()
+    for _ in workers:
+        event_queue.put(None)
+    for worker in workers:
+        worker.join()
+
+    reindex_executor.shutdown(wait=False)
+    cache.flush()
     logger.info("Daemon stopped.")